@@ -7,8 +7,9 @@ import click
 from . import __version__
 from .config import config
 from .download import download_video
-from .clip import launch_mpv
+from .clip import launch_mpv, extract_single_clip
 from .process import process_clips
+from .jobs import serve_jobs, run_worker
 
 
 @click.group()
@@ -31,7 +32,9 @@ def download(url: str, quality: Optional[str]):
 
 @cli.command()
 @click.argument('video_path', type=click.Path(exists=True, path_type=Path))
-def watch(video_path: Path):
+@click.option('--profile', default=None,
+              help='Encode profile for extracted clips (default: ENCODE_PROFILE)')
+def watch(video_path: Path, profile: Optional[str]):
     """
     Launch MPV with clip marking enabled.
     
@@ -39,11 +42,47 @@ def watch(video_path: Path):
     Clips are automatically saved to vault/CLIP_SUB_DIR/raw-clips/ folder.
     """
     try:
-        launch_mpv(video_path)
+        launch_mpv(video_path, profile)
     except Exception as e:
         raise click.ClickException(str(e))
 
 
+@cli.command()
+@click.argument('video_path', type=click.Path(exists=True, path_type=Path))
+@click.argument('start')
+@click.argument('end')
+@click.argument('label')
+@click.option('--profile', default=None,
+              help='Encode profile (copy/fast/balanced/small/tiny, default: ENCODE_PROFILE)')
+@click.option('--output-dir', default=None, type=click.Path(path_type=Path),
+              help='Output folder (default: vault/CLIP_SUB_DIR/raw-clips/)')
+def extract(
+    video_path: Path,
+    start: str,
+    end: str,
+    label: str,
+    profile: Optional[str],
+    output_dir: Optional[Path]
+):
+    """
+    Extract a clip between START and END (HH:MM:SS.mmm) named after LABEL.
+    
+    This is what the MPV script runs when a clip is committed.
+    """
+    try:
+        output_path = extract_single_clip(
+            video_path,
+            start,
+            end,
+            label,
+            output_dir or config.clips_dir,
+            profile
+        )
+    except Exception as e:
+        raise click.ClickException(str(e))
+    click.echo(output_path)
+
+
 @cli.command()
 @click.option('--model', default=None,
               help='Whisper model size (tiny/base/small/medium/large)')
@@ -81,5 +120,73 @@ def process(
         raise click.ClickException(str(e))
 
 
+@cli.command()
+@click.option('--host', default=None, help='Interface to bind (default: JOB_SERVER_HOST)')
+@click.option('--port', default=None, type=int, help='Port to listen on (default: JOB_SERVER_PORT)')
+@click.option('--lease', default=None, type=int,
+              help='Seconds a worker may hold a job without renewing it')
+@click.option('--resume', is_flag=True,
+              help='Skip already processed clips')
+@click.option('--exit-when-done', is_flag=True,
+              help='Stop the server once every job has finished')
+def serve(
+    host: Optional[str],
+    port: Optional[int],
+    lease: Optional[int],
+    resume: bool,
+    exit_when_done: bool
+):
+    """
+    Serve clips from vault/CLIP_SUB_DIR/raw-clips/ to workers.
+    
+    Each label group is leased to one worker at a time. Expired leases are
+    reassigned. Results are saved to vault/Media/ and vault/Techniques/ by the server.
+    """
+    try:
+        serve_jobs(host, port, lease, resume, exit_when_done)
+    except Exception as e:
+        raise click.ClickException(str(e))
+
+
+@cli.command()
+@click.option('--server', default=None,
+              help='Job server URL (default: JOB_SERVER_URL)')
+@click.option('--worker-id', default=None,
+              help='Name reported to the server (default: hostname-pid)')
+@click.option('--model', default=None,
+              help='Whisper model size (tiny/base/small/medium/large)')
+@click.option('--llm-provider', default=None,
+              help='LLM provider (openai/anthropic)')
+@click.option('--llm-model', default=None,
+              help='LLM model name')
+@click.option('--skip-transcription', is_flag=True,
+              help='Use existing transcript files')
+def worker(
+    server: Optional[str],
+    worker_id: Optional[str],
+    model: Optional[str],
+    llm_provider: Optional[str],
+    llm_model: Optional[str],
+    skip_transcription: bool
+):
+    """
+    Process jobs from a running 'clipjits serve' until the queue is drained.
+    
+    The vault must be shared with the server (e.g. on a NAS). Run several
+    workers, on one or more machines, to process groups in parallel.
+    """
+    try:
+        run_worker(
+            server,
+            worker_id,
+            model,
+            llm_provider,
+            llm_model,
+            skip_transcription
+        )
+    except Exception as e:
+        raise click.ClickException(str(e))
+
+
 if __name__ == '__main__':
     cli()
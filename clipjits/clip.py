@@ -1,19 +1,320 @@
 """Clip management and MPV integration."""
 
+import os
 import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional, List
 import click
 
 from .config import config
 from .utils import to_snake_case, parse_timestamp
 
 
+def _video_args(profile: dict, threads: int) -> List[str]:
+    """Build ffmpeg video encoding arguments for a profile."""
+    args = ['-c:v', config.ffmpeg_video_codec]
+    if profile.get('preset'):
+        args += ['-preset', profile['preset']]
+    if profile.get('crf') is not None:
+        args += ['-crf', str(profile['crf'])]
+    if profile.get('max_height'):
+        # Only downscale, keep width even for yuv420p
+        args += ['-vf', f"scale=-2:'min(ih,{profile['max_height']})'"]
+    args += ['-threads', str(threads)]
+    return args
+
+
+def _run_ffmpeg(cmd: List[str]):
+    try:
+        subprocess.run(
+            cmd,
+            check=True,
+            capture_output=True,
+            text=True
+        )
+    except subprocess.CalledProcessError as e:
+        raise click.ClickException(f"FFmpeg extraction failed: {e.stderr}")
+    except FileNotFoundError:
+        raise click.ClickException(
+            "FFmpeg not found. Please install FFmpeg."
+        )
+
+
+def has_audio_stream(source_video: Path) -> bool:
+    """Check whether a video has at least one audio stream using ffprobe."""
+    cmd = [
+        'ffprobe',
+        '-v', 'error',
+        '-select_streams', 'a',
+        '-show_entries', 'stream=index',
+        '-of', 'csv=p=0',
+        str(source_video)
+    ]
+    try:
+        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+    except subprocess.CalledProcessError as e:
+        raise click.ClickException(f"FFprobe failed: {e.stderr}")
+    except FileNotFoundError:
+        raise click.ClickException(
+            "FFprobe not found. Please install FFmpeg."
+        )
+    return bool(result.stdout.strip())
+
+
+def find_keyframes(source_video: Path, start_seconds: float, end_seconds: float) -> List[float]:
+    """
+    List video keyframe timestamps within a time range using ffprobe.
+    
+    Only packet headers are read, nothing is decoded.
+    """
+    cmd = [
+        'ffprobe',
+        '-v', 'error',
+        '-select_streams', 'v:0',
+        '-read_intervals', f"{start_seconds}%{end_seconds}",
+        '-show_entries', 'packet=pts_time,flags',
+        '-of', 'csv=p=0',
+        str(source_video)
+    ]
+    try:
+        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return []
+    
+    keyframes = []
+    for line in result.stdout.splitlines():
+        parts = line.strip().split(',')
+        if len(parts) < 2 or 'K' not in parts[1]:
+            continue
+        try:
+            pts = float(parts[0])
+        except ValueError:
+            continue
+        if start_seconds < pts < end_seconds:
+            keyframes.append(pts)
+    return sorted(set(keyframes))
+
+
+def plan_segments(
+    start_seconds: float,
+    end_seconds: float,
+    keyframes: List[float],
+    pieces: int
+) -> List[tuple[float, float]]:
+    """
+    Split a time range into roughly equal pieces cut at keyframes.
+    
+    Args:
+        start_seconds: Range start
+        end_seconds: Range end
+        keyframes: Keyframe timestamps inside the range
+        pieces: Desired number of pieces
+    
+    Returns:
+        List of (start, end) tuples covering the whole range
+    """
+    duration = end_seconds - start_seconds
+    # Keep pieces at least half their ideal length so no encode is a sliver
+    min_piece = duration / pieces / 2
+    cuts = []
+    for i in range(1, pieces):
+        target = start_seconds + duration * i / pieces
+        previous = cuts[-1] if cuts else start_seconds
+        candidates = [
+            k for k in keyframes
+            if k - previous >= min_piece and end_seconds - k >= min_piece
+        ]
+        if not candidates:
+            break
+        cut = min(candidates, key=lambda k: abs(k - target))
+        cuts.append(cut)
+    
+    bounds = [start_seconds] + cuts + [end_seconds]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _encode_segmented(
+    source_video: Path,
+    segments: List[tuple[float, float]],
+    output_path: Path,
+    profile: dict,
+    threads: int
+):
+    """Encode video pieces concurrently, then join them with a single audio pass."""
+    has_audio = has_audio_stream(source_video)
+    # Callers never plan more pieces than threads, so the total stays capped
+    per_segment_threads = max(1, threads // len(segments))
+    
+    # Intermediate files stay local, the output folder may be on a NAS
+    with tempfile.TemporaryDirectory(prefix='clipjits-') as tmp:
+        tmp_dir = Path(tmp)
+        
+        def encode_piece(index: int, start: float, end: float) -> Path:
+            piece_path = tmp_dir / f"part_{index:03d}.mp4"
+            _run_ffmpeg([
+                'ffmpeg',
+                '-y',
+                # Single-threaded decode, the pieces already run in parallel
+                '-threads', '1',
+                '-ss', str(start),
+                '-i', str(source_video),
+                '-t', str(end - start),
+                '-an',
+                *_video_args(profile, per_segment_threads),
+                '-avoid_negative_ts', 'make_zero',
+                str(piece_path)
+            ])
+            return piece_path
+        
+        # Audio is encoded in one pass, AAC pieces would click at the joins
+        audio_path = tmp_dir / 'audio.m4a'
+        total = segments[-1][1] - segments[0][0]
+        audio_cmd = [
+            'ffmpeg',
+            '-y',
+            '-ss', str(segments[0][0]),
+            '-i', str(source_video),
+            '-t', str(total),
+            '-vn',
+            '-c:a', config.ffmpeg_audio_codec,
+            '-threads', '1',
+            str(audio_path)
+        ]
+        
+        with ThreadPoolExecutor(max_workers=len(segments) + 1) as executor:
+            audio_future = executor.submit(_run_ffmpeg, audio_cmd) if has_audio else None
+            futures = [
+                executor.submit(encode_piece, i, start, end)
+                for i, (start, end) in enumerate(segments)
+            ]
+            pieces = [f.result() for f in futures]
+            if audio_future is not None:
+                audio_future.result()
+        
+        concat_list = tmp_dir / 'pieces.txt'
+        concat_list.write_text(
+            ''.join(f"file '{p.as_posix()}'\n" for p in pieces),
+            encoding='utf-8'
+        )
+        
+        mux_cmd = [
+            'ffmpeg',
+            '-y',
+            '-f', 'concat',
+            '-safe', '0',
+            '-i', str(concat_list)
+        ]
+        if has_audio:
+            mux_cmd += ['-i', str(audio_path), '-map', '0:v', '-map', '1:a']
+        mux_cmd += ['-c', 'copy', '-f', 'mp4', str(output_path)]
+        _run_ffmpeg(mux_cmd)
+
+
+def encode_clip(
+    source_video: Path,
+    start_seconds: float,
+    end_seconds: float,
+    output_path: Path,
+    profile_name: Optional[str] = None
+) -> Path:
+    """
+    Cut and encode a time range of a video with an encode profile.
+    
+    Clips of at least SEGMENT_MIN_DURATION seconds are split at keyframes and
+    the pieces encoded concurrently across SEGMENT_WORKERS processes.
+    
+    Args:
+        source_video: Path to source video file
+        start_seconds: Start time in seconds
+        end_seconds: End time in seconds
+        output_path: Output file path
+        profile_name: Encode profile name (default: ENCODE_PROFILE)
+    
+    Returns:
+        Path to encoded clip
+    """
+    profile = config.get_encode_profile(profile_name)
+    duration = end_seconds - start_seconds
+    
+    if duration <= 0:
+        raise click.ClickException("End time must be after start time")
+    
+    # Write under a non-.mp4 name and rename when done, so nothing scanning
+    # the clips folder (e.g. 'clipjits serve') picks up a half-written clip
+    partial_path = output_path.with_name(f"{output_path.name}.part")
+    try:
+        _encode_to(source_video, start_seconds, end_seconds, partial_path, profile)
+        os.replace(partial_path, output_path)
+    finally:
+        partial_path.unlink(missing_ok=True)
+    
+    return output_path
+
+
+def _encode_to(
+    source_video: Path,
+    start_seconds: float,
+    end_seconds: float,
+    output_path: Path,
+    profile: dict
+):
+    duration = end_seconds - start_seconds
+    
+    if profile.get('copy'):
+        _run_ffmpeg([
+            'ffmpeg',
+            '-y',
+            '-ss', str(start_seconds),
+            '-i', str(source_video),
+            '-t', str(duration),
+            '-c', 'copy',
+            '-avoid_negative_ts', 'make_zero',
+            '-f', 'mp4',
+            str(output_path)
+        ])
+        return
+    
+    threads = profile.get('threads') or 0
+    # ENCODE_THREADS caps the total, so run no more pieces than threads
+    workers = min(config.segment_workers, threads) if threads else config.segment_workers
+    
+    if workers > 1 and duration >= config.segment_min_duration:
+        keyframes = find_keyframes(source_video, start_seconds, end_seconds)
+        segments = plan_segments(start_seconds, end_seconds, keyframes, workers)
+        if len(segments) > 1:
+            _encode_segmented(
+                source_video,
+                segments,
+                output_path,
+                profile,
+                threads or max(os.cpu_count() or 1, len(segments))
+            )
+            return
+    
+    _run_ffmpeg([
+        'ffmpeg',
+        '-y',
+        '-ss', str(start_seconds),
+        '-i', str(source_video),
+        '-t', str(duration),
+        *_video_args(profile, threads),
+        '-c:a', config.ffmpeg_audio_codec,
+        '-avoid_negative_ts', 'make_zero',
+        '-f', 'mp4',
+        str(output_path)
+    ])
+
+
 def extract_single_clip(
     source_video: Path,
     start_time: str,
     end_time: str,
     label: str,
-    output_dir: Path
+    output_dir: Path,
+    profile_name: Optional[str] = None
 ) -> Path:
     """
     Extract a single clip using ffmpeg.
@@ -24,48 +325,22 @@ def extract_single_clip(
         end_time: End timestamp (HH:MM:SS.mmm)
         label: Clip label
         output_dir: Output directory for clip
+        profile_name: Encode profile name (default: ENCODE_PROFILE)
     
     Returns:
-        Path to extracted clip
+        Path to extracted clip, named {label}.mp4 so clips group by label
     """
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Convert source name to snake_case
-    source_name = to_snake_case(source_video.stem)
-    label_snake = to_snake_case(label)
-    
-    output_filename = f"{source_name}_{label_snake}.mp4"
-    output_path = output_dir / output_filename
+    output_path = output_dir / f"{to_snake_case(label)}.mp4"
     
     start_seconds = parse_timestamp(start_time)
     end_seconds = parse_timestamp(end_time)
-    duration = end_seconds - start_seconds
-    
-    cmd = [
-        'ffmpeg',
-        '-y',
-        '-ss', str(start_seconds),
-        '-i', str(source_video),
-        '-t', str(duration),
-        '-c:v', config.ffmpeg_video_codec,
-        '-c:a', config.ffmpeg_audio_codec,
-        '-avoid_negative_ts', 'make_zero',
-        str(output_path)
-    ]
     
-    try:
-        subprocess.run(
-            cmd,
-            check=True,
-            capture_output=True,
-            text=True
-        )
-        return output_path
-    except subprocess.CalledProcessError as e:
-        raise click.ClickException(f"FFmpeg extraction failed: {e.stderr}")
+    return encode_clip(source_video, start_seconds, end_seconds, output_path, profile_name)
 
 
-def launch_mpv(video_path: Path):
+def launch_mpv(video_path: Path, profile_name: Optional[str] = None):
     """Launch MPV with clipping script enabled."""
     if not video_path.exists():
         raise click.ClickException(f"Video file not found: {video_path}")
@@ -80,14 +355,27 @@ def launch_mpv(video_path: Path):
         )
         cmd = ['mpv', str(video_path)]
     else:
-        # Pass configuration to Lua script
+        # Validate early rather than on the first commit inside MPV
+        try:
+            profile_name = profile_name or config.encode_profile
+            config.get_encode_profile(profile_name)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+        
+        # Pass configuration to Lua script, which extracts clips through
+        # 'clipjits extract' so encode profiles apply there too
         clips_dir = config.clips_dir
+        script_opts = ','.join([
+            f'clipjits-clips-dir={clips_dir}',
+            f'clipjits-python={sys.executable}',
+            f'clipjits-profile={profile_name}',
+        ])
         cmd = [
             'mpv',
             '--msg-level=all=no,clipjits=info',
             '--term-status-msg=',
             f'--script={script_path}',
-            f'--script-opts=clipjits-clips-dir={clips_dir}',
+            f'--script-opts={script_opts}',
             str(video_path)
         ]
     
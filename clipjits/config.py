@@ -7,6 +7,17 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Named ffmpeg encode profiles for clip extraction (speed/size trade-offs).
+# preset/crf apply to x264/x265, threads=0 lets ffmpeg decide, max_height
+# downscales taller sources. "copy" skips re-encoding (cuts snap to keyframes).
+ENCODE_PROFILES = {
+    "copy": {"copy": True},
+    "fast": {"preset": "veryfast", "crf": 23, "threads": 0, "max_height": None},
+    "balanced": {"preset": "medium", "crf": 22, "threads": 0, "max_height": None},
+    "small": {"preset": "slow", "crf": 26, "threads": 0, "max_height": 720},
+    "tiny": {"preset": "slow", "crf": 30, "threads": 0, "max_height": 480},
+}
+
 
 class Config:
     """Central configuration for ClipJits."""
@@ -39,6 +50,26 @@ class Config:
 
         self.ffmpeg_video_codec = os.getenv("FFMPEG_VIDEO_CODEC", "libx264")
         self.ffmpeg_audio_codec = os.getenv("FFMPEG_AUDIO_CODEC", "aac")
+        self.encode_profile = os.getenv("ENCODE_PROFILE", "balanced")
+        # Total encoder threads, overrides the profile when set (0 = ffmpeg default)
+        encode_threads = os.getenv("ENCODE_THREADS")
+        self.encode_threads = int(encode_threads) if encode_threads else None
+
+        # Segmented encoding: clips at least this long (seconds) are split at
+        # keyframes and the pieces encoded concurrently
+        self.segment_min_duration = float(os.getenv("SEGMENT_MIN_DURATION", "120"))
+        self.segment_workers = int(os.getenv("SEGMENT_WORKERS", str(os.cpu_count() or 1)))
+
+        # Distributed processing (clipjits serve / clipjits worker)
+        self.job_server_host = os.getenv("JOB_SERVER_HOST", "127.0.0.1")
+        self.job_server_port = int(os.getenv("JOB_SERVER_PORT", "8765"))
+        self.job_server_url = os.getenv(
+            "JOB_SERVER_URL", f"http://{self.job_server_host}:{self.job_server_port}"
+        )
+        self.job_lease_seconds = int(os.getenv("JOB_LEASE_SECONDS", "300"))
+        self.job_max_attempts = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+        # Seconds an idle worker waits before asking the server again
+        self.job_poll_interval = float(os.getenv("JOB_POLL_INTERVAL", "5"))
 
     def ensure_directories(self):
         """Create necessary directories if they don't exist."""
@@ -56,5 +87,18 @@ class Config:
             return False
         return True
 
+    def get_encode_profile(self, name: Optional[str] = None) -> dict:
+        """Return the named encode profile, defaulting to ENCODE_PROFILE."""
+        name = name or self.encode_profile
+        if name not in ENCODE_PROFILES:
+            raise ValueError(
+                f"Unknown encode profile: {name} "
+                f"(choose from {', '.join(ENCODE_PROFILES)})"
+            )
+        profile = dict(ENCODE_PROFILES[name])
+        if self.encode_threads is not None and not profile.get("copy"):
+            profile["threads"] = self.encode_threads
+        return profile
+
 
 config = Config()
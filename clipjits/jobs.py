@@ -0,0 +1,501 @@
+"""Distributed clip processing with a lease-based job server."""
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional, List, Dict
+from urllib import request as urlrequest
+from urllib.error import URLError
+import click
+
+from .config import config
+from .process import group_clips_by_label, summarize_group, save_technique
+
+PENDING = "pending"
+LEASED = "leased"
+SAVING = "saving"
+DONE = "done"
+FAILED = "failed"
+
+
+class Job:
+    """A label group of clips handed out to workers under a lease."""
+
+    def __init__(self, label: str, clips: List[str]):
+        self.label = label
+        self.clips = clips
+        self.status = PENDING
+        self.lease_id: Optional[str] = None
+        self.worker: Optional[str] = None
+        self.expires_at = 0.0
+        self.attempts = 0
+        self.error: Optional[str] = None
+
+    def to_dict(self, lease_seconds: int) -> dict:
+        return {
+            "job_id": self.label,
+            "label": self.label,
+            "clips": self.clips,
+            "lease_id": self.lease_id,
+            "lease_seconds": lease_seconds,
+        }
+
+
+class JobQueue:
+    """
+    Thread-safe queue of label groups from the raw-clips folder.
+
+    Each job is leased to one worker at a time. Leases that are not renewed
+    expire and the job is handed to the next worker that asks. Results are
+    only accepted from the current lease holder, so a group is saved once.
+    """
+
+    def __init__(
+        self,
+        clips_dir: Path,
+        lease_seconds: int = 300,
+        max_attempts: int = 3
+    ):
+        self.clips_dir = clips_dir
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self):
+        """Add label groups that appeared in the clips folder since the last scan."""
+        groups = group_clips_by_label(self.clips_dir)
+        with self._lock:
+            for label, video_paths in sorted(groups.items()):
+                clips = [p.name for p in video_paths]
+                job = self.jobs.get(label)
+                # Finished groups only come back when clips that were not part
+                # of the job show up. Skipped groups, failed groups and clips
+                # left behind by a partially applied save stay put
+                if job is None or (
+                    job.status in (DONE, FAILED) and set(clips) - set(job.clips)
+                ):
+                    self.jobs[label] = Job(label, clips)
+
+    def _expire_leases(self):
+        now = time.monotonic()
+        for job in self.jobs.values():
+            if job.status != LEASED or job.expires_at > now:
+                continue
+            # A worker that dies or hangs on a group uses up an attempt too,
+            # otherwise a group that kills its worker is reassigned forever
+            job.error = f"lease expired (worker {job.worker})"
+            if job.attempts >= self.max_attempts:
+                job.status = FAILED
+                click.echo(f"Failed: {job.label} ({job.error})", err=True)
+            else:
+                job.status = PENDING
+                click.echo(f"Lease expired: {job.label} (worker {job.worker})")
+
+    def _lookup(self, job_id: str, lease_id: str, status: str = LEASED) -> Optional[Job]:
+        job = self.jobs.get(job_id)
+        if job is None or job.lease_id != lease_id or job.status != status:
+            return None
+        return job
+
+    def claim(self, worker: str) -> Optional[Job]:
+        """Lease the next pending job to a worker."""
+        with self._lock:
+            self._expire_leases()
+            has_pending = any(j.status == PENDING for j in self.jobs.values())
+        if not has_pending:
+            self.refresh()
+
+        with self._lock:
+            for label in sorted(self.jobs):
+                job = self.jobs[label]
+                if job.status != PENDING:
+                    continue
+                job.status = LEASED
+                job.lease_id = uuid.uuid4().hex
+                job.worker = worker
+                job.expires_at = time.monotonic() + self.lease_seconds
+                job.attempts += 1
+                click.echo(f"Leased: {job.label} -> {worker} (attempt {job.attempts})")
+                return job
+        return None
+
+    def renew(self, job_id: str, lease_id: str) -> bool:
+        """Extend a lease. Returns False if the lease was lost."""
+        with self._lock:
+            self._expire_leases()
+            job = self._lookup(job_id, lease_id)
+            if job is None:
+                return False
+            job.expires_at = time.monotonic() + self.lease_seconds
+            return True
+
+    def begin_complete(self, job_id: str, lease_id: str) -> Optional[Job]:
+        """Accept a result from the lease holder and mark the job as saving."""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            # A late result is still valid as long as nobody else took the job
+            if job is None or job.lease_id != lease_id or job.status not in (LEASED, PENDING):
+                return None
+            job.status = SAVING
+            return job
+
+    def end_complete(self, job: Job, error: Optional[str] = None):
+        """
+        Finish a completion started with begin_complete.
+
+        A save error fails the job for good rather than retrying it: the save
+        may already have copied media or moved some clips, so the leftovers
+        need a manual look (or a plain 'clipjits process') before a rerun.
+        """
+        with self._lock:
+            if error is None:
+                job.status = DONE
+            else:
+                job.status = FAILED
+                job.error = error
+
+    def fail(self, job_id: str, lease_id: str, error: str) -> bool:
+        """Release a job after a worker error, retrying up to max_attempts."""
+        with self._lock:
+            job = self._lookup(job_id, lease_id)
+            if job is None:
+                return False
+            job.error = error
+            job.lease_id = None
+            if job.attempts >= self.max_attempts:
+                job.status = FAILED
+                click.echo(f"Failed: {job.label} ({error})", err=True)
+            else:
+                job.status = PENDING
+                click.echo(f"Requeued: {job.label} ({error})", err=True)
+            return True
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            self._expire_leases()
+            counts = {PENDING: 0, LEASED: 0, SAVING: 0, DONE: 0, FAILED: 0}
+            for job in self.jobs.values():
+                counts[job.status] += 1
+            return counts
+
+    def drained(self) -> bool:
+        """True when no job is waiting, leased or being saved."""
+        counts = self.counts()
+        return counts[PENDING] == 0 and counts[LEASED] == 0 and counts[SAVING] == 0
+
+
+def _make_handler(queue: JobQueue, resume: bool):
+    save_lock = threading.Lock()
+
+    class JobRequestHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, payload: dict, status: int = 200):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == '/status':
+                self._send({"counts": queue.counts(), "drained": queue.drained()})
+            else:
+                self._send({"error": f"Unknown path: {self.path}"}, 404)
+
+        def do_POST(self):
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                data = json.loads(self.rfile.read(length) or b'{}')
+            except ValueError:
+                self._send({"error": "Invalid JSON body"}, 400)
+                return
+            if not isinstance(data, dict):
+                self._send({"error": "JSON body must be an object"}, 400)
+                return
+
+            if self.path == '/claim':
+                job = queue.claim(data.get('worker', 'unknown'))
+                self._send({
+                    "job": job.to_dict(queue.lease_seconds) if job else None,
+                    "drained": queue.drained(),
+                })
+            elif self.path == '/renew':
+                self._send({"ok": queue.renew(data.get('job_id'), data.get('lease_id'))})
+            elif self.path == '/fail':
+                ok = queue.fail(
+                    data.get('job_id'), data.get('lease_id'), data.get('error', 'unknown error')
+                )
+                self._send({"ok": ok})
+            elif self.path == '/complete':
+                self._complete(data)
+            else:
+                self._send({"error": f"Unknown path: {self.path}"}, 404)
+
+        def _complete(self, data: dict):
+            job = queue.begin_complete(data.get('job_id'), data.get('lease_id'))
+            if job is None:
+                self._send({"ok": False})
+                return
+
+            click.echo(f"Saving: {job.label} (worker {job.worker})")
+            video_paths = [queue.clips_dir / name for name in job.clips]
+            try:
+                # Saving touches shared Media/ and Techniques/ names, one group at a time
+                with save_lock:
+                    output_file = save_technique(
+                        video_paths, data['technique_name'], data['summary'], resume
+                    )
+            except Exception as e:
+                queue.end_complete(job, str(e))
+                click.echo(f"  Processing failed: {e}", err=True)
+                click.echo(
+                    f"  Check the remaining clips of '{job.label}' before processing it again.",
+                    err=True
+                )
+                self._send({"ok": True, "saved": None, "error": str(e)})
+                return
+
+            queue.end_complete(job)
+            self._send({
+                "ok": True,
+                "saved": output_file.name if output_file else None,
+                "drained": queue.drained(),
+            })
+
+    return JobRequestHandler
+
+
+def serve_jobs(
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    lease_seconds: Optional[int] = None,
+    resume: bool = False,
+    exit_when_done: bool = False
+):
+    """
+    Run the job server that hands out label groups from the raw-clips folder.
+
+    Workers claim groups, transcribe and summarize them, and report the
+    results back. The server writes media, markdown and moves clips, so all
+    vault changes happen in one place.
+
+    Args:
+        host: Interface to bind
+        port: TCP port to listen on
+        lease_seconds: Seconds a worker may hold a job without renewing it
+        resume: Skip already processed clips
+        exit_when_done: Stop once every job has finished
+    """
+    host = host or config.job_server_host
+    port = port or config.job_server_port
+    lease_seconds = lease_seconds or config.job_lease_seconds
+
+    clips_dir = config.clips_dir
+    config.ensure_directories()
+
+    if not clips_dir.exists():
+        raise click.ClickException(f"Clips directory not found: {clips_dir}")
+
+    queue = JobQueue(clips_dir, lease_seconds, config.job_max_attempts)
+
+    try:
+        server = ThreadingHTTPServer((host, port), _make_handler(queue, resume))
+    except OSError as e:
+        raise click.ClickException(f"Could not start job server on {host}:{port}: {e}")
+
+    click.echo(f"Job server listening on http://{host}:{port}")
+    click.echo(f"Found {len(queue.jobs)} technique(s) to process.\n")
+
+    # Keep answering after the queue drains so idle workers, and workers that
+    # just reported, get to see it is empty instead of a refused connection
+    drain_grace = config.job_poll_interval + lease_seconds
+    drained_since = None
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        while thread.is_alive():
+            if exit_when_done and queue.drained():
+                drained_since = drained_since or time.monotonic()
+                if time.monotonic() - drained_since >= drain_grace:
+                    break
+            else:
+                drained_since = None
+            time.sleep(min(1, drain_grace))
+    except KeyboardInterrupt:
+        click.echo("\nStopping job server...")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    counts = queue.counts()
+    click.echo(
+        f"Job server stopped. Done: {counts[DONE]}, failed: {counts[FAILED]}, "
+        f"pending: {counts[PENDING] + counts[LEASED]}."
+    )
+
+
+def _post(server_url: str, path: str, payload: dict) -> dict:
+    data = json.dumps(payload).encode('utf-8')
+    req = urlrequest.Request(
+        server_url.rstrip('/') + path,
+        data=data,
+        headers={'Content-Type': 'application/json'},
+        method='POST'
+    )
+    try:
+        with urlrequest.urlopen(req, timeout=30) as response:
+            return json.loads(response.read())
+    except (URLError, OSError) as e:
+        raise click.ClickException(f"Job server request failed ({path}): {e}")
+
+
+def _report(server_url: str, path: str, payload: dict) -> Optional[dict]:
+    """Post a job result, logging instead of raising when the server is unreachable."""
+    try:
+        return _post(server_url, path, payload)
+    except click.ClickException as e:
+        # The server may still be saving an earlier group (or this one);
+        # losing one report must not stop the worker
+        click.echo(f"  Could not report to job server: {e.message}\n", err=True)
+        return None
+
+
+def _keep_lease(server_url: str, job: dict, stop: threading.Event, lost: threading.Event):
+    interval = max(job['lease_seconds'] / 3, 1)
+    payload = {"job_id": job['job_id'], "lease_id": job['lease_id']}
+    while not stop.wait(interval):
+        try:
+            if not _post(server_url, '/renew', payload)['ok']:
+                # The group may already belong to another worker, stop touching it
+                lost.set()
+                return
+        except click.ClickException as e:
+            # Keep trying, the lease only expires if renewals stay down
+            click.echo(f"  Lease renewal failed: {e.message}", err=True)
+
+
+def run_worker(
+    server_url: Optional[str] = None,
+    worker_id: Optional[str] = None,
+    whisper_model: Optional[str] = None,
+    llm_provider: Optional[str] = None,
+    llm_model: Optional[str] = None,
+    skip_transcription: bool = False,
+    poll_interval: Optional[float] = None
+):
+    """
+    Claim jobs from a job server until its queue is drained.
+
+    Clips are read from this machine's vault/CLIP_SUB_DIR/raw-clips/, so the
+    vault must be shared between the server and its workers.
+
+    Args:
+        server_url: Job server URL
+        worker_id: Name reported to the server
+        whisper_model: Whisper model size
+        llm_provider: LLM provider
+        llm_model: LLM model name
+        skip_transcription: Use existing transcript files
+        poll_interval: Seconds to wait when all jobs are leased elsewhere
+    """
+    server_url = server_url or config.job_server_url
+    poll_interval = poll_interval or config.job_poll_interval
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    whisper_model = whisper_model or config.whisper_model_size
+    llm_provider = llm_provider or config.llm_provider
+    llm_model = llm_model or config.llm_model
+
+    if not config.validate_api_keys():
+        raise click.ClickException(
+            f"API key not configured for provider: {llm_provider}. "
+            "Please set the appropriate API key in your .env file."
+        )
+
+    click.echo(f"Worker {worker_id} connected to {server_url}\n")
+    processed = 0
+    seen_empty = False
+
+    while True:
+        try:
+            response = _post(server_url, '/claim', {"worker": worker_id})
+        except click.ClickException:
+            # A server started with --exit-when-done stops once the queue drains
+            if seen_empty:
+                break
+            raise
+        job = response['job']
+
+        if job is None:
+            seen_empty = True
+            if response['drained']:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        video_paths = [config.clips_dir / name for name in job['clips']]
+        lease = {"job_id": job['job_id'], "lease_id": job['lease_id']}
+
+        click.echo(f"Processing: {job['label']}")
+        click.echo(f"  Clips in group: {len(video_paths)}")
+
+        stop = threading.Event()
+        lost = threading.Event()
+        keeper = threading.Thread(
+            target=_keep_lease, args=(server_url, job, stop, lost), daemon=True
+        )
+        keeper.start()
+        try:
+            result = summarize_group(
+                video_paths,
+                whisper_model,
+                llm_provider,
+                llm_model,
+                skip_transcription,
+                lost
+            )
+        except Exception as e:
+            click.echo(f"  Processing failed: {e}", err=True)
+            _report(server_url, '/fail', {**lease, "error": str(e)})
+            continue
+        finally:
+            stop.set()
+            keeper.join()
+
+        if lost.is_set():
+            click.echo("  Lease lost, result discarded.\n", err=True)
+            continue
+
+        if result is None:
+            _report(server_url, '/fail', {**lease, "error": "no transcripts available"})
+            continue
+
+        technique_name, summary = result
+        response = _report(
+            server_url,
+            '/complete',
+            {**lease, "technique_name": technique_name, "summary": summary}
+        )
+        if response is None:
+            continue
+
+        seen_empty = response.get('drained', False)
+        if not response['ok']:
+            click.echo("  Lease lost, result discarded.\n", err=True)
+        elif response.get('error'):
+            click.echo(f"  Server failed to save: {response['error']}\n", err=True)
+        else:
+            processed += 1
+            click.echo(f"  Reported: {response['saved'] or 'skipped'}\n")
+
+    click.echo(f"Queue drained. Worker processed {processed} technique(s).")
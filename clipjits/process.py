@@ -1,6 +1,7 @@
 """Batch processing of clips with transcription and LLM summarization."""
 
 import shutil
+import threading
 from pathlib import Path
 from typing import Optional, List, Dict
 from collections import defaultdict
@@ -201,6 +202,157 @@ def group_clips_by_label(clips_dir: Path) -> Dict[str, List[Path]]:
     return dict(groups)
 
 
+def summarize_group(
+    video_paths: List[Path],
+    whisper_model: str,
+    llm_provider: str,
+    llm_model: Optional[str],
+    skip_transcription: bool = False,
+    cancelled: Optional[threading.Event] = None
+) -> Optional[tuple[str, str]]:
+    """
+    Transcribe a group of clips and generate its technique summary.
+    
+    Transcripts are written next to each clip as .txt files.
+    
+    Args:
+        video_paths: Clips belonging to one label group
+        whisper_model: Whisper model size
+        llm_provider: LLM provider
+        llm_model: LLM model name
+        skip_transcription: Use existing transcript files
+        cancelled: Stop before the next transcript write or LLM call once set
+    
+    Returns:
+        Tuple of (technique_name, markdown_content), or None if no
+        transcripts could be produced or the work was cancelled
+    """
+    def is_cancelled() -> bool:
+        if cancelled is not None and cancelled.is_set():
+            click.echo("  Cancelled, skipping group.")
+            return True
+        return False
+    
+    transcripts = []
+    
+    for video_path in video_paths:
+        if is_cancelled():
+            return None
+        
+        transcript_file = video_path.with_suffix('.txt')
+        
+        if skip_transcription and transcript_file.exists():
+            click.echo(f"  Using existing transcript: {transcript_file.name}")
+            with open(transcript_file, 'r', encoding='utf-8') as f:
+                transcript = f.read().strip()
+        else:
+            try:
+                transcript = transcribe_video(video_path, whisper_model)
+                
+                if is_cancelled():
+                    return None
+                
+                with open(transcript_file, 'w', encoding='utf-8') as f:
+                    f.write(transcript)
+                
+            except Exception as e:
+                click.echo(f"  Transcription failed: {e}", err=True)
+                continue
+        
+        transcripts.append(transcript)
+    
+    if not transcripts:
+        click.echo(f"  No transcripts available, skipping group.")
+        return None
+    
+    if is_cancelled():
+        return None
+    
+    click.echo(f"  Generating technique summary with {llm_provider}...")
+    
+    # Generate with original filenames for embedding
+    original_filenames = [p.name for p in video_paths]
+    return generate_technique_summary(
+        transcripts,
+        original_filenames,
+        llm_provider,
+        llm_model
+    )
+
+
+def save_technique(
+    video_paths: List[Path],
+    technique_name: str,
+    summary: str,
+    resume: bool = False
+) -> Optional[Path]:
+    """
+    Write a technique card and archive its clips.
+    
+    Media files are copied to vault/Media/, markdown is saved to
+    vault/Techniques/ and the clips (with transcripts) are moved to
+    vault/CLIP_SUB_DIR/processed-clips/.
+    
+    Args:
+        video_paths: Clips belonging to one label group
+        technique_name: Technique name returned by the LLM
+        summary: Markdown content embedding the original clip filenames
+        resume: Skip techniques whose markdown already exists
+    
+    Returns:
+        Path to the saved markdown file, or None if skipped
+    """
+    media_dir = config.media_dir
+    techniques_dir = config.techniques_dir
+    processed_dir = config.clips_processed_dir
+    
+    original_filenames = [p.name for p in video_paths]
+    
+    # Convert technique name to snake_case for filename
+    technique_filename = to_snake_case(technique_name)
+    
+    # Copy media files to Media/ with numbered suffix
+    media_filenames = []
+    for idx, video_path in enumerate(video_paths, 1):
+        media_filename = f"{technique_filename}_{idx}.mp4"
+        media_path = media_dir / media_filename
+        shutil.copy2(video_path, media_path)
+        media_filenames.append(media_filename)
+        click.echo(f"  Copied to media: {media_filename}")
+    
+    # Update markdown to reference new media filenames with spacing
+    for original, new in zip(original_filenames, media_filenames):
+        summary = summary.replace(f"![[{original}]]", f"![[{new}]]")
+    
+    # Save markdown to Techniques/ (convert snake_case to Title Case)
+    technique_readable = technique_filename.replace('_', ' ').title()
+    output_file = techniques_dir / f"{technique_readable}.md"
+    
+    if resume and output_file.exists():
+        click.echo(f"  Skipping - already processed: {output_file.name}")
+        return None
+    
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(summary)
+    
+    click.echo(f"  Saved technique: {output_file.name}")
+    
+    # Move processed clips to processed/ directory
+    for video_path in video_paths:
+        processed_path = processed_dir / video_path.name
+        shutil.move(str(video_path), str(processed_path))
+        
+        # Also move transcript files if they exist
+        transcript_file = video_path.with_suffix('.txt')
+        if transcript_file.exists():
+            processed_transcript = processed_dir / transcript_file.name
+            shutil.move(str(transcript_file), str(processed_transcript))
+    
+    click.echo(f"  Moved {len(video_paths)} clip(s) to processed/\n")
+    
+    return output_file
+
+
 def process_clips(
     whisper_model: Optional[str] = None,
     llm_provider: Optional[str] = None,
@@ -222,15 +374,9 @@ def process_clips(
         resume: Skip already processed clips
     """
     clips_dir = config.clips_dir
-    processed_dir = config.clips_processed_dir
-    media_dir = config.media_dir
-    techniques_dir = config.techniques_dir
     
     # Ensure directories exist
-    clips_dir.mkdir(parents=True, exist_ok=True)
-    processed_dir.mkdir(parents=True, exist_ok=True)
-    media_dir.mkdir(parents=True, exist_ok=True)
-    techniques_dir.mkdir(parents=True, exist_ok=True)
+    config.ensure_directories()
     
     whisper_model = whisper_model or config.whisper_model_size
     llm_provider = llm_provider or config.llm_provider
@@ -258,89 +404,22 @@ def process_clips(
         click.echo(f"[{group_idx}/{total_groups}] Processing: {label_name}")
         click.echo(f"  Clips in group: {len(video_paths)}")
         
-        transcripts = []
-        
-        for video_path in video_paths:
-            transcript_file = video_path.with_suffix('.txt')
-            
-            if skip_transcription and transcript_file.exists():
-                click.echo(f"  Using existing transcript: {transcript_file.name}")
-                with open(transcript_file, 'r', encoding='utf-8') as f:
-                    transcript = f.read().strip()
-            else:
-                try:
-                    transcript = transcribe_video(video_path, whisper_model)
-                    
-                    with open(transcript_file, 'w', encoding='utf-8') as f:
-                        f.write(transcript)
-                    
-                except Exception as e:
-                    click.echo(f"  Transcription failed: {e}", err=True)
-                    continue
-            
-            transcripts.append(transcript)
-        
-        if not transcripts:
-            click.echo(f"  No transcripts available, skipping group.")
-            continue
-        
-        click.echo(f"  Generating technique summary with {llm_provider}...")
-        
         try:
-            # Generate with original filenames for embedding
-            original_filenames = [p.name for p in video_paths]
-            technique_name, summary = generate_technique_summary(
-                transcripts,
-                original_filenames,
+            result = summarize_group(
+                video_paths,
+                whisper_model,
                 llm_provider,
-                llm_model
+                llm_model,
+                skip_transcription
             )
-            
-            # Convert technique name to snake_case for filename
-            technique_filename = to_snake_case(technique_name)
-            
-            # Copy media files to Media/ with numbered suffix
-            media_filenames = []
-            for idx, video_path in enumerate(video_paths, 1):
-                media_filename = f"{technique_filename}_{idx}.mp4"
-                media_path = media_dir / media_filename
-                shutil.copy2(video_path, media_path)
-                media_filenames.append(media_filename)
-                click.echo(f"  Copied to media: {media_filename}")
-            
-            # Update markdown to reference new media filenames with spacing
-            for original, new in zip(original_filenames, media_filenames):
-                summary = summary.replace(f"![[{original}]]", f"![[{new}]]")
-            
-            # Save markdown to Techniques/ (convert snake_case to Title Case)
-            technique_readable = technique_filename.replace('_', ' ').title()
-            output_file = techniques_dir / f"{technique_readable}.md"
-            
-            if resume and output_file.exists():
-                click.echo(f"  Skipping - already processed: {output_file.name}")
+            if result is None:
                 continue
             
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(summary)
-            
-            click.echo(f"  Saved technique: {output_file.name}")
-            
-            # Move processed clips to processed/ directory
-            for video_path in video_paths:
-                processed_path = processed_dir / video_path.name
-                shutil.move(str(video_path), str(processed_path))
-                
-                # Also move transcript files if they exist
-                transcript_file = video_path.with_suffix('.txt')
-                if transcript_file.exists():
-                    processed_transcript = processed_dir / transcript_file.name
-                    shutil.move(str(transcript_file), str(processed_transcript))
-            
-            click.echo(f"  Moved {len(video_paths)} clip(s) to processed/\n")
+            technique_name, summary = result
+            save_technique(video_paths, technique_name, summary, resume)
             
         except Exception as e:
             click.echo(f"  Processing failed: {e}", err=True)
             continue
     
     click.echo(f"Processing complete. Processed {total_groups} technique(s).")
-
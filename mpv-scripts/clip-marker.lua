@@ -2,37 +2,14 @@
 -- Keybindings: s (start), e (end), c (commit)
 local clip_start = nil
 local clip_end = nil
-local clips_dir = nil
+local options = nil
 
-function get_clips_dir()
-    if clips_dir then
-        return clips_dir
+function get_option(name)
+    if not options then
+        options = mp.get_property_native("script-opts")
     end
 
-    local script_opts = mp.get_property_native("script-opts")
-    clips_dir = script_opts["clipjits-clips-dir"]
-
-    return clips_dir
-end
-
-function to_snake_case(text)
-    -- Convert to lowercase
-    text = string.lower(text)
-    -- Replace spaces and hyphens with underscores
-    text = string.gsub(text, "[%s%-]+", "_")
-    -- Remove special characters
-    text = string.gsub(text, "[^%w_]", "")
-    -- Remove multiple underscores
-    text = string.gsub(text, "_+", "_")
-    -- Trim underscores from start and end
-    text = string.gsub(text, "^_+", "")
-    text = string.gsub(text, "_+$", "")
-    -- Truncate to 50 characters
-    if string.len(text) > 50 then
-        text = string.sub(text, 1, 50)
-        text = string.gsub(text, "_+$", "")
-    end
-    return text
+    return options["clipjits-" .. name]
 end
 
 function format_timestamp(seconds)
@@ -44,70 +21,47 @@ function format_timestamp(seconds)
 end
 
 function extract_clip(source_video, start_time, end_time, label)
-    local dir = get_clips_dir()
-    
-    -- Ensure directory exists
-    if package.config:sub(1,1) == '\\' then
-        os.execute('if not exist "' .. dir .. '" mkdir "' .. dir .. '"')
-    else
-        os.execute('mkdir -p "' .. dir .. '"')
+    -- Extraction is done by 'clipjits extract' so encode profiles apply here too
+    local args = {
+        get_option("python") or "python", "-m", "clipjits", "extract",
+        "--output-dir", get_option("clips-dir"),
+    }
+    local profile = get_option("profile")
+    if profile and profile ~= "" then
+        table.insert(args, "--profile")
+        table.insert(args, profile)
+    end
+    -- Options end here, so labels starting with '-' are not parsed as options
+    for _, arg in ipairs({"--", source_video, start_time, end_time, label}) do
+        table.insert(args, arg)
     end
-    
-    label = to_snake_case(label)
-    
-    local output_filename = label .. ".mp4"
-    local output_path = dir .. "/" .. output_filename
-    
-    -- Calculate duration
-    local start_seconds = parse_timestamp(start_time)
-    local end_seconds = parse_timestamp(end_time)
-    local duration = end_seconds - start_seconds
-    
-    -- Build ffmpeg command (suppress output)
-    local cmd
-    if package.config:sub(1,1) == '\\' then
-        -- Windows
-        cmd = string.format(
-            'ffmpeg -y -ss %f -i "%s" -t %f -c:v libx264 -c:a aac -avoid_negative_ts make_zero "%s" >nul 2>&1',
-            start_seconds, source_video, duration, output_path
-        )
-    else
-        -- Unix
-        cmd = string.format(
-            "ffmpeg -y -ss %f -i '%s' -t %f -c:v libx264 -c:a aac -avoid_negative_ts make_zero '%s' >/dev/null 2>&1",
-            start_seconds, source_video, duration, output_path
-        )
-    end
-    
+
     mp.osd_message("Extracting clip...", 2)
-    
-    local result = os.execute(cmd)
-    
-    if result == 0 or result == true then
+
+    local result = mp.command_native({
+        name = "subprocess",
+        args = args,
+        playback_only = false,
+        capture_stdout = true,
+        capture_stderr = true,
+    })
+
+    if result and result.status == 0 then
+        local output_path = (result.stdout or ""):gsub("%s+$", "")
+        local output_filename = output_path:match("([^/\\]+)$") or output_path
         mp.osd_message("✓ Clip saved: " .. output_filename, 3)
         print("[ClipJits] ✓ Clip saved: " .. output_filename)
         return true
     else
         mp.osd_message("✗ Extraction failed", 3)
-        print("[ClipJits] ✗ FATAL ERROR: Extraction failed for " .. output_filename)
+        print("[ClipJits] ✗ FATAL ERROR: Extraction failed for " .. label)
+        if result and result.stderr and result.stderr ~= "" then
+            print(result.stderr)
+        end
         return false
     end
 end
 
-function parse_timestamp(timestamp)
-    local hours, minutes, seconds = timestamp:match("(%d+):(%d+):([%d.]+)")
-    if hours then
-        return tonumber(hours) * 3600 + tonumber(minutes) * 60 + tonumber(seconds)
-    end
-    
-    minutes, seconds = timestamp:match("(%d+):([%d.]+)")
-    if minutes then
-        return tonumber(minutes) * 60 + tonumber(seconds)
-    end
-    
-    return tonumber(timestamp) or 0
-end
-
 function mark_start()
     clip_start = mp.get_property_number("time-pos")
     if clip_start then
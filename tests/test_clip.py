@@ -0,0 +1,114 @@
+"""Tests for clip extraction and encode profiles."""
+
+import subprocess
+
+import click
+import pytest
+
+from clipjits import clip
+from clipjits import config as config_module
+from clipjits.clip import plan_segments, find_keyframes, encode_clip
+
+
+@pytest.fixture
+def test_config(tmp_path, monkeypatch):
+    """Use a fresh Config with a temporary vault in clip.py."""
+    monkeypatch.setenv("VAULT_PATH", str(tmp_path))
+    monkeypatch.delenv("ENCODE_THREADS", raising=False)
+    monkeypatch.delenv("ENCODE_PROFILE", raising=False)
+    cfg = config_module.Config()
+    monkeypatch.setattr(clip, "config", cfg)
+    return cfg
+
+
+def test_plan_segments_even_split():
+    keyframes = [float(k) for k in range(5, 100, 5)]
+    assert plan_segments(0, 100, keyframes, 4) == [
+        (0, 25.0), (25.0, 50.0), (50.0, 75.0), (75.0, 100)
+    ]
+
+
+def test_plan_segments_without_keyframes_is_single_piece():
+    assert plan_segments(5, 185, [], 4) == [(5, 185)]
+
+
+def test_plan_segments_skips_keyframes_closer_than_min_piece():
+    # min_piece is 22.5s here, so 10 (too close to the start) and
+    # 180 (too close to the end) are never used as cuts
+    assert plan_segments(5, 185, [10, 180], 4) == [(5, 185)]
+    assert plan_segments(5, 185, [10, 50, 180], 4) == [(5, 50), (50, 185)]
+
+
+def test_find_keyframes_parses_ffprobe_csv(monkeypatch):
+    output = "0.000000,K__\n5.500000,___\n10.000000,K_\n20.000000,K__\nN/A,K__\n\n"
+
+    def fake_run(cmd, **kwargs):
+        assert cmd[0] == "ffprobe"
+        return subprocess.CompletedProcess(cmd, 0, stdout=output, stderr="")
+
+    monkeypatch.setattr(clip.subprocess, "run", fake_run)
+    assert find_keyframes("video.mp4", 1, 19) == [10.0]
+
+
+def test_find_keyframes_without_ffprobe(monkeypatch):
+    def fake_run(cmd, **kwargs):
+        raise FileNotFoundError(cmd[0])
+
+    monkeypatch.setattr(clip.subprocess, "run", fake_run)
+    assert find_keyframes("video.mp4", 0, 10) == []
+
+
+def test_video_args_scale_and_threads(test_config):
+    args = clip._video_args(test_config.get_encode_profile("small"), 3)
+
+    assert args[:2] == ["-c:v", "libx264"]
+    assert args[args.index("-preset") + 1] == "slow"
+    assert args[args.index("-crf") + 1] == "26"
+    assert args[args.index("-vf") + 1] == "scale=-2:'min(ih,720)'"
+    assert args[args.index("-threads") + 1] == "3"
+
+
+def test_video_args_without_max_height(test_config):
+    args = clip._video_args(test_config.get_encode_profile("fast"), 0)
+
+    assert "-vf" not in args
+    assert args[args.index("-threads") + 1] == "0"
+
+
+def test_get_encode_profile_unknown_name(test_config):
+    with pytest.raises(ValueError, match="Unknown encode profile"):
+        test_config.get_encode_profile("bogus")
+
+
+def test_encode_threads_overrides_non_copy_profiles(monkeypatch):
+    monkeypatch.setenv("ENCODE_THREADS", "2")
+    cfg = config_module.Config()
+
+    assert cfg.encode_threads == 2
+    assert cfg.get_encode_profile("fast")["threads"] == 2
+    assert "threads" not in cfg.get_encode_profile("copy")
+    # The shared profile table is left untouched
+    assert config_module.ENCODE_PROFILES["fast"]["threads"] == 0
+
+
+def test_empty_encode_threads_is_unset(monkeypatch):
+    monkeypatch.setenv("ENCODE_THREADS", "")
+    assert config_module.Config().encode_threads is None
+
+
+def test_encode_clip_removes_partial_output_on_failure(test_config, tmp_path, monkeypatch):
+    output_path = tmp_path / "kimura.mp4"
+
+    def fake_run(cmd, **kwargs):
+        # ffmpeg wrote part of the file before failing
+        with open(cmd[-1], "w") as f:
+            f.write("partial")
+        raise subprocess.CalledProcessError(1, cmd, stderr="boom")
+
+    monkeypatch.setattr(clip.subprocess, "run", fake_run)
+
+    with pytest.raises(click.ClickException, match="boom"):
+        encode_clip(tmp_path / "source.mp4", 0, 10, output_path, "fast")
+
+    assert not output_path.exists()
+    assert not list(tmp_path.glob("*.part"))
@@ -0,0 +1,204 @@
+"""Tests for the distributed job server and workers."""
+
+import json
+import socket
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from urllib import request as urlrequest
+from urllib.error import HTTPError
+
+import pytest
+
+from clipjits import config as config_module
+from clipjits import jobs, process
+from clipjits.jobs import JobQueue, DONE, FAILED, LEASED, PENDING, SAVING
+
+
+CLIPS = ["arm drag 1", "arm drag 2", "kimura", "arm bar1", "triangle"]
+
+
+@pytest.fixture
+def vault(tmp_path, monkeypatch):
+    """Point config at a temporary vault with a few raw clips."""
+    monkeypatch.setenv("VAULT_PATH", str(tmp_path))
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    test_config = config_module.Config()
+    test_config.ensure_directories()
+    test_config.job_poll_interval = 0.1
+
+    monkeypatch.setattr(jobs, "config", test_config)
+    monkeypatch.setattr(process, "config", test_config)
+
+    for name in CLIPS:
+        (test_config.clips_dir / f"{name}.mp4").write_text("clip")
+    return test_config
+
+
+def test_claim_leases_each_group_once(vault):
+    queue = JobQueue(vault.clips_dir, lease_seconds=60)
+
+    labels = []
+    while (job := queue.claim("w")) is not None:
+        assert job.status == LEASED
+        labels.append(job.label)
+
+    assert sorted(labels) == ["arm bar", "arm drag", "kimura", "triangle"]
+    assert queue.jobs["arm drag"].clips == ["arm drag 1.mp4", "arm drag 2.mp4"]
+    assert not queue.drained()
+
+
+def test_renew_rejects_wrong_lease(vault):
+    queue = JobQueue(vault.clips_dir, lease_seconds=60)
+    job = queue.claim("w")
+
+    assert queue.renew(job.label, job.lease_id)
+    assert not queue.renew(job.label, "stale")
+
+
+def test_expired_lease_is_reassigned(vault):
+    queue = JobQueue(vault.clips_dir, lease_seconds=0.2)
+    first = queue.claim("a")
+    first_lease = first.lease_id
+    time.sleep(0.3)
+
+    assert not queue.renew(first.label, first_lease)
+    second = queue.claim("b")
+    assert second.label == first.label
+    assert second.worker == "b"
+    # The first worker's result is no longer accepted
+    assert queue.begin_complete(first.label, first_lease) is None
+    assert queue.begin_complete(second.label, second.lease_id) is second
+
+
+def test_expired_leases_count_toward_max_attempts(vault):
+    queue = JobQueue(vault.clips_dir, lease_seconds=0.1, max_attempts=2)
+    label = queue.claim("a").label
+    time.sleep(0.2)
+    assert queue.claim("b").label == label
+    time.sleep(0.2)
+
+    queue.counts()
+    assert queue.jobs[label].status == FAILED
+
+
+def test_fail_requeues_until_max_attempts(vault):
+    queue = JobQueue(vault.clips_dir, lease_seconds=60, max_attempts=2)
+    job = queue.claim("w")
+    label = job.label
+
+    assert queue.fail(label, job.lease_id, "boom")
+    assert queue.jobs[label].status == PENDING
+
+    job = queue.claim("w")
+    assert job.label == label
+    assert queue.fail(label, job.lease_id, "boom")
+    assert queue.jobs[label].status == FAILED
+
+
+def test_complete_marks_job_done(vault):
+    queue = JobQueue(vault.clips_dir, lease_seconds=60)
+    job = queue.claim("w")
+
+    assert queue.begin_complete(job.label, job.lease_id) is job
+    assert job.status == SAVING
+    # A second completion for the same lease is rejected
+    assert queue.begin_complete(job.label, job.lease_id) is None
+    queue.end_complete(job)
+    assert job.status == DONE
+
+
+def test_partial_save_leftovers_are_not_requeued(vault):
+    queue = JobQueue(vault.clips_dir, lease_seconds=60)
+    job = queue.claim("w")
+    while job.label != "arm drag":
+        job = queue.claim("w")
+
+    # The save moved one clip before failing
+    (vault.clips_dir / "arm drag 1.mp4").unlink()
+    queue.begin_complete(job.label, job.lease_id)
+    queue.end_complete(job, "disk full")
+    queue.refresh()
+    assert queue.jobs["arm drag"] is job
+    assert job.status == FAILED
+
+    # New clips for the same label are picked up again
+    (vault.clips_dir / "arm drag 3.mp4").write_text("clip")
+    queue.refresh()
+    assert queue.jobs["arm drag"].status == PENDING
+    assert queue.jobs["arm drag"].clips == ["arm drag 2.mp4", "arm drag 3.mp4"]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_server_rejects_non_object_body(vault):
+    queue = JobQueue(vault.clips_dir, lease_seconds=60)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), jobs._make_handler(queue, False))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        port = server.server_address[1]
+        req = urlrequest.Request(
+            f"http://127.0.0.1:{port}/claim",
+            data=json.dumps([]).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with pytest.raises(HTTPError) as excinfo:
+            urlrequest.urlopen(req, timeout=5)
+        assert excinfo.value.code == 400
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_multiple_workers_drain_queue(vault, monkeypatch):
+    calls = []
+    calls_lock = threading.Lock()
+
+    def fake_summarize(video_paths, *args, **kwargs):
+        with calls_lock:
+            calls.append(video_paths[0].stem)
+        time.sleep(0.2)
+        embeds = "\n".join(f"![[{p.name}]]" for p in video_paths)
+        return video_paths[0].stem, f"Notes\n\n{embeds}"
+
+    monkeypatch.setattr(jobs, "summarize_group", fake_summarize)
+
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}"
+    server = threading.Thread(
+        target=jobs.serve_jobs,
+        kwargs={"host": "127.0.0.1", "port": port, "lease_seconds": 1, "exit_when_done": True},
+    )
+    server.start()
+    time.sleep(0.3)
+
+    errors = []
+
+    def work(worker_id):
+        try:
+            jobs.run_worker(server_url=url, worker_id=worker_id)
+        except Exception as e:
+            errors.append(e)
+
+    workers = [threading.Thread(target=work, args=(f"w{i}",)) for i in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=30)
+    server.join(timeout=30)
+
+    assert not errors
+    assert not server.is_alive()
+    assert len(calls) == 4
+    assert sorted(p.name for p in vault.techniques_dir.iterdir()) == [
+        "Arm Bar1.md", "Arm Drag 1.md", "Kimura.md", "Triangle.md"
+    ]
+    assert not list(vault.clips_dir.glob("*.mp4"))
+    assert len(list(vault.clips_processed_dir.glob("*.mp4"))) == len(CLIPS)